@@ -61,17 +61,28 @@ def root():
     }
 
 @app.get("/emails/unread")
-def get_unread_emails(limit: int = Query(5, ge=1, le=50, description="Maximum number of emails to fetch")):
+def get_unread_emails(
+    limit: int = Query(5, ge=1, le=50, description="Maximum number of emails to fetch"),
+    sender: Optional[str] = Query(None, description="Only return emails from this address"),
+    subject_contains: Optional[str] = Query(None, description="Only return emails whose subject contains this text"),
+):
     """
     Fetch unread emails from your Gmail inbox.
-    
+
     Parameters:
     - **limit**: Maximum number of unread emails to retrieve (1-50)
-    
+    - **sender**: Optional sender filter, applied server-side
+    - **subject_contains**: Optional subject filter, applied server-side
+
     Returns a list of unread emails with their details.
     """
     tool = GetUnreadEmailsTool()
-    emails = tool._run(limit=limit)
+    try:
+        emails = tool._run(limit=limit, sender=sender, subject_contains=subject_contains)
+    except ValueError as e:
+        # Invalid filter values (quotes/non-ASCII the IMAP SEARCH grammar
+        # cannot carry) are a client error, not a server failure
+        raise HTTPException(status_code=422, detail=str(e))
     return {"emails": emails}
 
 @app.get("/emails/thread-history")
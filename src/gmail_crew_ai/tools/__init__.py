@@ -1,8 +1,9 @@
 from .gmail_tools import (
-    GetUnreadEmailsTool, 
-    SaveDraftTool, 
-    GmailOrganizeTool, 
+    GetUnreadEmailsTool,
+    SaveDraftTool,
+    GmailOrganizeTool,
     GmailDeleteTool,
+    MarkEmailsAsReadTool,
     EmptyTrashTool,
     GetThreadHistoryTool,  # Add new tool
     ContextAwareReplyTool,  # Add new tool
@@ -13,6 +14,7 @@ __all__ = [
     "SaveDraftTool",
     "GmailOrganizeTool",
     "GmailDeleteTool",
+    "MarkEmailsAsReadTool",
     "EmptyTrashTool",
     "GetThreadHistoryTool",  # Add new tool
     "ContextAwareReplyTool",  # Add new tool
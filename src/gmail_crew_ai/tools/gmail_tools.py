@@ -5,14 +5,24 @@
 import imaplib
 import email
 from email.header import decode_header
+from email.parser import BytesHeaderParser, BytesParser
+from email import policy
 from typing import List, Tuple, Literal, Optional, Type, Dict, Any
+from operator import itemgetter
 import re
 from bs4 import BeautifulSoup
 from crewai.tools import BaseTool
 import os
-from pydantic import BaseModel, Field
+import json
+from pydantic import BaseModel, Field, PrivateAttr
 from crewai.tools import tool
 import time
+import threading
+import atexit
+import itertools
+import heapq
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import datetime  # Add this import
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -22,21 +32,282 @@ import base64
 # Utility Functions
 # -------------------------------
 
+# Header-only parser: stops at the blank line, skipping the MIME body entirely.
+# Much cheaper than email.message_from_bytes when only metadata is needed.
+_HEADER_PARSER = BytesHeaderParser()
+
+# Full-message parser on the modern policy: produces EmailMessage objects
+# whose get_body() picks the preferred body part directly, without the
+# compat32 walk over every MIME part.
+_BYTES_PARSER = BytesParser(policy=policy.default)
+
+# Prefer the Rust-backed orjson encoder for the draft log when installed;
+# drafts can carry large HTML bodies that dominate serialization time.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pybase64 (SIMD libbase64) speeds up base64-encoding large non-ASCII
+# draft bodies; the stdlib encoder is the drop-in fallback.
+try:
+    import pybase64 as _b64
+except ImportError:
+    _b64 = base64
+
+# Prefer the C-backed lxml parser when it is installed; the pure-Python
+# html.parser is far slower on real HTML email bodies.
+try:
+    import lxml  # noqa: F401
+    _BS4_PARSER = "lxml"
+except ImportError:
+    _BS4_PARSER = "html.parser"
+
+# Patterns used in per-message parsing loops, compiled once at import
+_WHITESPACE_RE = re.compile(r'\s+')
+_TZ_NAME_RE = re.compile(r'\s+\([A-Z]{3,4}\)')
+_ANGLE_ADDR_RE = re.compile(r'<([^>]+)>')
+_EMAIL_ADDR_RE = re.compile(r'[\w.\-]+@[\w.\-]+')
+_FETCH_SEQ_RE = re.compile(rb'(\d+)')  # sequence number opening a FETCH response envelope
+_FETCH_UID_RE = re.compile(rb'UID (\d+)')  # UID item inside a UID FETCH response envelope
+
+# Cap on IDs per FETCH command; oversized sets trigger
+# "maximum request size exceeded" errors on some servers. Overridable via
+# the FETCH_BATCH_SIZE environment variable; batches beyond ~100 have
+# shown no further round-trip savings.
+FETCH_BATCH_SIZE = int(os.environ.get("FETCH_BATCH_SIZE", "100"))
+
+# Upper bound on the body text kept per email; pathological messages
+# (huge threads, generated HTML) would otherwise balloon memory across
+# the accumulated result list.
+_MAX_BODY_CHARS = 1_000_000
+
+# Default FETCH items: headers plus body text via PEEK, so messages are
+# not implicitly flagged \Seen. Reassembled, this equals the RFC822 bytes.
+_PEEK_MESSAGE_PARTS = "(BODY.PEEK[HEADER] BODY.PEEK[TEXT])"
+
+# Thread history without attachment info only needs headers and a
+# bounded body prefix; the full text is required only to size
+# attachments, so it is fetched just for that case.
+_THREAD_FETCH_PARTS = "(BODY.PEEK[HEADER] BODY.PEEK[TEXT]<0.65536>)"
+
+# Unread listing only needs the headers the pipeline reads plus the first
+# 64 KiB of body text; attachments and anything beyond the prefix are
+# never downloaded. Content-Type/-Transfer-Encoding stay in the list so
+# the body literal can still be interpreted correctly.
+_UNREAD_FETCH_PARTS = (
+    "(BODY.PEEK[HEADER.FIELDS (DATE FROM TO SUBJECT MESSAGE-ID IN-REPLY-TO REFERENCES "
+    "CONTENT-TYPE CONTENT-TRANSFER-ENCODING)] BODY.PEEK[TEXT]<0.65536>)"
+)
+
+def _quote_search_string(value: str) -> str:
+    """
+    Quote a user-supplied SEARCH string, escaping backslashes and double
+    quotes per the IMAP quoted-string grammar. Raises ValueError for
+    CR/LF or non-ASCII input, which cannot be sent as a quoted string
+    without a charset negotiation imaplib does not do.
+    """
+    if '\r' in value or '\n' in value:
+        raise ValueError("search filter must not contain line breaks")
+    try:
+        value.encode('ascii')
+    except UnicodeEncodeError:
+        raise ValueError("search filter must be ASCII")
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def _bulk_fetch_groups(mail, msg_ids, parts: str = _PEEK_MESSAGE_PARTS,
+                       uid: bool = False) -> List[Tuple[bytes, List[bytes]]]:
+    """
+    Fetch many messages with one FETCH command per batch instead of one
+    round-trip per message. Returns one (id, literals) pair per message
+    (literals e.g. [header, body text]), in server order. With uid=True
+    the ids are UIDs and UID FETCH is issued, so results stay valid even
+    if a concurrent EXPUNGE renumbers the mailbox.
+    """
+    groups = []
+    for i in range(0, len(msg_ids), FETCH_BATCH_SIZE):
+        batch = [mid if isinstance(mid, bytes) else str(mid).encode() for mid in msg_ids[i:i + FETCH_BATCH_SIZE]]
+        id_set = b','.join(batch)
+        if uid:
+            result, data = mail.uid('FETCH', id_set, parts)
+        else:
+            result, data = mail.fetch(id_set, parts)
+        if result != "OK":
+            print(f"Error bulk-fetching batch of {len(batch)} messages: {result}")
+            continue
+        # The response holds one (envelope, payload) tuple per requested
+        # item, with a b')' entry closing each message; group the literals
+        # belonging to one message together. The first envelope of each
+        # message starts with its sequence number and, for UID FETCH,
+        # carries a UID item.
+        current = []
+        current_id = None
+        for item in data:
+            if isinstance(item, tuple):
+                if current_id is None:
+                    if uid:
+                        id_match = _FETCH_UID_RE.search(item[0])
+                    else:
+                        id_match = _FETCH_SEQ_RE.match(item[0])
+                    current_id = id_match.group(1) if id_match else b''
+                current.append(item[1])
+            elif current:
+                groups.append((current_id, current))
+                current, current_id = [], None
+        if current:
+            groups.append((current_id, current))
+    return groups
+
+def _bulk_fetch(mail, msg_ids, parts: str = _PEEK_MESSAGE_PARTS, uid: bool = False) -> List[bytes]:
+    """Like _bulk_fetch_groups, but reassembles one byte blob per message."""
+    return [b"".join(literals) for _, literals in _bulk_fetch_groups(mail, msg_ids, parts, uid=uid)]
+
+def _parse_thread_response(data: bytes) -> List[List[bytes]]:
+    """
+    Parse an RFC 5256 THREAD response like b'(2)(3 6 (4 23)(44 7 96))' into
+    one flat ID list per top-level thread; nesting within a thread only
+    encodes reply structure, which we do not need.
+    """
+    threads: List[List[bytes]] = []
+    current: List[bytes] = []
+    token = bytearray()
+    depth = 0
+    for byte in data:
+        if byte in b'()':
+            if token:
+                current.append(bytes(token))
+                token.clear()
+            depth += 1 if byte in b'(' else -1
+            if depth == 0 and current:
+                threads.append(current)
+                current = []
+        elif byte in b' \t':
+            if token:
+                current.append(bytes(token))
+                token.clear()
+        else:
+            token.append(byte)
+    if token:
+        current.append(bytes(token))
+    if current:
+        threads.append(current)
+    return threads
+
+def _message_from_literals(literals: List[bytes]) -> email.message.Message:
+    """
+    Build a Message from fetched (header, body) literals. When the body
+    bytes can be decoded directly — non-multipart and no content transfer
+    encoding — they are attached as `_preparsed_body` so _extract_body can
+    skip the MIME walk; otherwise the full message is parsed as usual.
+    """
+    if len(literals) < 2:
+        return _BYTES_PARSER.parsebytes(literals[0])
+    # Headers only: BytesHeaderParser stops at the blank line and skips
+    # MIME-tree construction. The multipart test reads the Content-Type
+    # header, since a header-only parse has no payload to inspect.
+    header_msg = _HEADER_PARSER.parsebytes(literals[0])
+    cte = (header_msg.get('Content-Transfer-Encoding') or '7bit').strip().lower()
+    if header_msg.get_content_maintype() != 'multipart' and cte in ('7bit', '8bit', 'binary'):
+        header_msg._preparsed_body = literals[1]
+        return header_msg
+    return _BYTES_PARSER.parsebytes(b"".join(literals))
+
+def _decode_bytes(data: bytes, charset: Optional[str]) -> str:
+    """Decode raw payload bytes, falling back to utf-8 on a bad charset."""
+    try:
+        return data.decode(charset or 'utf-8', errors='replace')
+    except LookupError:
+        return data.decode('utf-8', errors='replace')
+
+def _decode_part(part) -> str:
+    """Decode a MIME part's payload to text using its declared charset."""
+    payload = part.get_payload(decode=True)
+    if payload is None:
+        return ""
+    return _decode_bytes(payload, part.get_content_charset())
+
+# Draft signature handling: one compiled scan for the name placeholder
+# instead of two substring searches over the whole body.
+_SIGNATURE = "\n"
+_NAME_PLACEHOLDER_RE = re.compile(r'\[[Yy]our [Nn]ame\]')
+_SIG_PLACEHOLDER_RE = re.compile(r'\[[Yy]our')
+
+# Append-only audit log of saved drafts (see SaveDraftTool._log_draft).
+# Draft ids combine pid, nanosecond timestamp and a process-local counter
+# so concurrent saves never collide, unlike a second-resolution strftime.
+_DRAFTS_LOG_PATH = os.path.join("output", "saved_drafts.jsonl")
+_DRAFT_COUNTER = itertools.count()
+_PID = os.getpid()
+
+def _build_rfc822_bytes(from_addr: str, to_addr: str, subject: str, body: str,
+                        references: Optional[str] = None,
+                        in_reply_to: Optional[str] = None) -> Optional[bytes]:
+    """
+    Hand-assemble RFC822 bytes for the common simple draft: a single
+    text/plain part with ASCII headers. Skips the email.generator tree
+    walk and per-header Header re-encoding that EmailMessage.as_bytes()
+    pays. Returns None when a header needs RFC 2047 encoding so the
+    caller can fall back to the full EmailMessage path, and when any
+    header value contains CR/LF — values are spliced in verbatim here,
+    so a newline would inject extra headers; the EmailMessage path
+    rejects such values instead.
+    """
+    for value in (from_addr, to_addr, subject, references, in_reply_to):
+        if value and ('\r' in value or '\n' in value):
+            return None
+    lines = [
+        f"From: {from_addr}",
+        f"To: {to_addr}",
+        f"Subject: {subject}",
+        f"Date: {email.utils.formatdate(localtime=True)}",
+        "MIME-Version: 1.0",
+    ]
+    if references:
+        lines.append(f"References: {references}")
+    if in_reply_to:
+        lines.append(f"In-Reply-To: {in_reply_to}")
+    try:
+        body_bytes = body.encode('ascii')
+        lines.append('Content-Type: text/plain; charset="utf-8"')
+        lines.append("Content-Transfer-Encoding: 7bit")
+    except UnicodeEncodeError:
+        body_bytes = _b64.encodebytes(body.encode('utf-8')).replace(b'\n', b'\r\n')
+        lines.append('Content-Type: text/plain; charset="utf-8"')
+        lines.append("Content-Transfer-Encoding: base64")
+    try:
+        head = "\r\n".join(lines).encode('ascii')
+    except UnicodeEncodeError:
+        return None
+    return head + b"\r\n\r\n" + body_bytes
+
+@lru_cache(maxsize=512)
+def _decode_header_parts(header: str) -> str:
+    """
+    RFC 2047 decoding behind decode_header_safe. Memoized: threads repeat
+    the same handful of From/To/Subject headers for every message.
+    """
+    decoded_parts = []
+    for decoded_str, charset in decode_header(header):
+        if isinstance(decoded_str, bytes):
+            if charset:
+                decoded_parts.append(decoded_str.decode(charset, errors='replace'))
+            else:
+                # No declared charset: most headers are pure ASCII, and
+                # the ASCII decode is a fast path in CPython.
+                try:
+                    decoded_parts.append(decoded_str.decode('ascii'))
+                except UnicodeDecodeError:
+                    decoded_parts.append(decoded_str.decode('utf-8', errors='replace'))
+        else:
+            decoded_parts.append(str(decoded_str))
+    return ' '.join(decoded_parts)
+
 def decode_header_safe(header):
     """
     Safely decode email headers that might contain encoded words or non-ASCII characters.
     """
     try:
-        decoded_parts = []
-        for decoded_str, charset in decode_header(header):
-            if isinstance(decoded_str, bytes):
-                if charset:
-                    decoded_parts.append(decoded_str.decode(charset or 'utf-8', errors='replace'))
-                else:
-                    decoded_parts.append(decoded_str.decode('utf-8', errors='replace'))
-            else:
-                decoded_parts.append(str(decoded_str))
-        return ' '.join(decoded_parts)
+        return _decode_header_parts(header if isinstance(header, str) else str(header))
     except Exception as e:
         # Fallback to raw header if decoding fails
         return str(header)
@@ -45,16 +316,41 @@ def clean_email_body(email_body: str) -> str:
     """
     Clean the email body by removing HTML tags and excessive whitespace.
     """
+    # Plain-text fast path: skip HTML parsing entirely when nothing in the
+    # leading chunk looks like markup
+    if '<' not in email_body[:256]:
+        return _WHITESPACE_RE.sub(' ', email_body).strip()
     try:
-        soup = BeautifulSoup(email_body, "html.parser")
+        soup = BeautifulSoup(email_body, _BS4_PARSER)
         text = soup.get_text(separator=" ")  # Get text with spaces instead of <br/>
     except Exception as e:
         print(f"Error parsing HTML: {e}")
         text = email_body  # Fallback to raw body if parsing fails
     # Remove excessive whitespace and newlines
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _WHITESPACE_RE.sub(' ', text).strip()
     return text
 
+def _sort_messages_by_date(messages: List[Dict[str, Any]], latest_k: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Return message dicts sorted chronologically, parsing each Date header
+    exactly once instead of twice per sort comparison. When latest_k is
+    given, only the newest K messages are kept, selected with a heap
+    (O(N log K)) rather than sorting everything.
+    """
+    for m in messages:
+        try:
+            m['_sort_date'] = email.utils.parsedate_to_datetime(m['date']) or datetime.datetime.min
+        except Exception:
+            m['_sort_date'] = datetime.datetime.min
+    if latest_k is not None and len(messages) > latest_k:
+        messages = heapq.nlargest(latest_k, messages, key=itemgetter('_sort_date'))
+        messages.reverse()  # nlargest yields newest first; keep chronological order
+    else:
+        messages.sort(key=itemgetter('_sort_date'))
+    for m in messages:
+        del m['_sort_date']
+    return messages
+
 def format_thread_history(thread_history: Dict[str, Any]) -> str:
     """
     Format thread history into a readable string.
@@ -87,6 +383,100 @@ def format_thread_history(thread_history: Dict[str, Any]) -> str:
     
     return formatted
 
+# -------------------------------
+# IMAP Connection Pool
+# -------------------------------
+
+IMAP_HOST = "imap.gmail.com"
+
+# Idle connections older than this are re-authenticated instead of reused
+# (Gmail drops idle IMAP connections after roughly 30 minutes).
+_POOL_MAX_IDLE_SECONDS = 25 * 60
+
+_POOL: Dict[Tuple[str, str], imaplib.IMAP4_SSL] = {}
+_POOL_LAST_USED: Dict[Tuple[str, str], float] = {}
+_POOL_LOCK = threading.Lock()
+
+def _select_cached(mail, mailbox: str, readonly: bool = False) -> str:
+    """
+    SELECT a mailbox only when the connection is not already on it. The
+    current mailbox and mode are tracked on the connection object; the
+    cache is cleared on SELECT failure, on close(), and whenever code
+    selects a mailbox without going through this helper.
+    """
+    if getattr(mail, 'current_folder', None) == (mailbox, readonly):
+        return 'OK'
+    result, _ = mail.select(mailbox, readonly=readonly)
+    mail.current_folder = (mailbox, readonly) if result == 'OK' else None
+    return result
+
+def _connection_caps(mail) -> frozenset:
+    """
+    Capability set for a connection, decoded once and cached on the
+    connection object so nested tool calls don't re-parse it.
+    """
+    caps = getattr(mail, 'caps', None)
+    if caps is None:
+        caps = frozenset(c.decode() if isinstance(c, bytes) else c for c in mail.capabilities)
+        mail.caps = caps
+    return caps
+
+def _pool_get(email_address: str, app_password: str, host: str = IMAP_HOST) -> imaplib.IMAP4_SSL:
+    """
+    Check out an authenticated IMAP connection for (host, user).
+
+    A pooled connection is reused when it was returned recently and still
+    answers a NOOP probe; otherwise a fresh connection is logged in. Each
+    connection is handed to exactly one caller at a time.
+    """
+    key = (host, email_address)
+    with _POOL_LOCK:
+        mail = _POOL.pop(key, None)
+        last_used = _POOL_LAST_USED.pop(key, 0.0)
+
+    if mail is not None:
+        if time.monotonic() - last_used < _POOL_MAX_IDLE_SECONDS:
+            try:
+                mail.noop()
+                return mail
+            except Exception:
+                pass  # Stale connection; fall through and reconnect
+        try:
+            mail.logout()
+        except Exception:
+            pass
+
+    mail = imaplib.IMAP4_SSL(host)
+    mail.login(email_address, app_password)
+    _connection_caps(mail)
+    return mail
+
+def _pool_put(mail: imaplib.IMAP4_SSL, email_address: str, host: str = IMAP_HOST):
+    """Return a connection to the pool instead of logging out."""
+    key = (host, email_address)
+    with _POOL_LOCK:
+        previous = _POOL.get(key)
+        _POOL[key] = mail
+        _POOL_LAST_USED[key] = time.monotonic()
+    if previous is not None and previous is not mail:
+        try:
+            previous.logout()
+        except Exception:
+            pass
+
+@atexit.register
+def _pool_shutdown():
+    """Log out all pooled connections on interpreter shutdown."""
+    with _POOL_LOCK:
+        connections = list(_POOL.values())
+        _POOL.clear()
+        _POOL_LAST_USED.clear()
+    for mail in connections:
+        try:
+            mail.logout()
+        except Exception:
+            pass
+
 # -------------------------------
 # Base Gmail Tool
 # -------------------------------
@@ -107,11 +497,10 @@ class GmailToolBase(BaseTool):
             raise ValueError("EMAIL_ADDRESS and APP_PASSWORD must be set in the environment.")
 
     def _connect(self):
-        """Connect to Gmail."""
+        """Connect to Gmail, reusing a pooled connection when available."""
         try:
             print(f"Connecting to Gmail with email: {self.email_address[:3]}...{self.email_address[-8:]}")
-            mail = imaplib.IMAP4_SSL("imap.gmail.com")
-            mail.login(self.email_address, self.app_password)
+            mail = _pool_get(self.email_address, self.app_password)
             print("Successfully logged in to Gmail")
             return mail
         except Exception as e:
@@ -119,11 +508,14 @@ class GmailToolBase(BaseTool):
             raise e
 
     def _disconnect(self, mail):
-        """Disconnect from Gmail."""
+        """Return the connection to the pool for the next tool invocation."""
         try:
             mail.close()
-            mail.logout()
-            print("Successfully disconnected from Gmail")
+        except:
+            pass
+        mail.current_folder = None
+        try:
+            _pool_put(mail, self.email_address)
         except:
             pass
 
@@ -150,15 +542,15 @@ class GmailToolBase(BaseTool):
             search_query = ' OR '.join(search_terms)
 
             try:
-                result, data = mail.search(None, search_query)
+                result, data = mail.uid('SEARCH', None, search_query)
                 if result == "OK" and data[0]:
                     thread_ids = data[0].split()
                     print(f"Found {len(thread_ids)} messages in thread")
-                    
+
                     for thread_id in thread_ids:
-                        result, msg_data = mail.fetch(thread_id, "(RFC822)")
+                        result, msg_data = mail.uid('FETCH', thread_id, "(RFC822)")
                         if result == "OK":
-                            thread_msg = email.message_from_bytes(msg_data[0][1])
+                            thread_msg = _BYTES_PARSER.parsebytes(msg_data[0][1])
                             
                             # Extract useful metadata and body
                             message_info = {
@@ -174,34 +566,65 @@ class GmailToolBase(BaseTool):
             except Exception as e:
                 print(f"Error searching for thread messages: {e}")
         
-        # Sort messages by date
-        thread_messages.sort(key=lambda x: email.utils.parsedate_to_datetime(x['date']) 
-                          if x.get('date') and email.utils.parsedate_to_datetime(x['date']) 
-                          else datetime.datetime.min)
-        return thread_messages
+        # Sort messages by date (parse each date once instead of twice per comparison)
+        return _sort_messages_by_date(thread_messages)
 
     def _extract_body(self, msg) -> str:
         """Extract body from an email message."""
+        # Raw body bytes captured during FETCH (see _message_from_literals);
+        # decode them directly instead of walking MIME parts
+        preparsed = getattr(msg, '_preparsed_body', None)
+        if preparsed is not None:
+            text = _decode_bytes(preparsed, msg.get_content_charset())
+            if msg.get_content_type() == "text/html":
+                return clean_email_body(text)
+            return text
+
+        if hasattr(msg, 'get_body'):
+            # EmailMessage (modern policy): pick the preferred body part
+            # directly instead of walking and decoding every part
+            try:
+                part = msg.get_body(preferencelist=('html', 'plain'))
+                if part is None:
+                    return ""
+                text = part.get_content()
+                if part.get_content_type() == "text/html":
+                    return clean_email_body(text)
+                return text
+            except Exception:
+                pass  # fall back to the manual walk below
+
         body = ""
         if msg.is_multipart():
+            # Select the preferred part first, then decode exactly one:
+            # decoding both alternatives of a multipart/alternative just
+            # to keep one is wasted work. html is preferred, matching
+            # the get_body preference list above.
+            html_part = None
+            text_part = None
             for part in msg.walk():
                 content_type = part.get_content_type()
+
+                # Check the part type before touching the payload so
+                # attachments and non-text parts are never decoded
+                if content_type not in ("text/plain", "text/html"):
+                    continue
                 content_disposition = str(part.get("Content-Disposition"))
+                if "attachment" in content_disposition:
+                    continue
 
-                try:
-                    email_body = part.get_payload(decode=True).decode()
-                except:
-                    email_body = ""
+                if content_type == "text/html":
+                    html_part = part
+                    break  # preferred part found; stop walking
+                if text_part is None:
+                    text_part = part
 
-                if content_type == "text/plain" and "attachment" not in content_disposition:
-                    body += email_body
-                elif content_type == "text/html" and "attachment" not in content_disposition:
-                    body += clean_email_body(email_body)
+            if html_part is not None:
+                body = clean_email_body(_decode_part(html_part))
+            elif text_part is not None:
+                body = _decode_part(text_part)
         else:
-            try:
-                body = clean_email_body(msg.get_payload(decode=True).decode())
-            except Exception as e:
-                body = f"Error decoding body: {e}"
+            body = clean_email_body(_decode_part(msg))
         return body
 
 # -------------------------------
@@ -215,6 +638,14 @@ class GetUnreadEmailsSchema(BaseModel):
         description="Maximum number of unread emails to retrieve. Defaults to 5.",
         ge=1  # Ensures the limit is greater than or equal to 1
     )
+    sender: Optional[str] = Field(
+        default=None,
+        description="Only return emails from this address (filtered server-side)"
+    )
+    subject_contains: Optional[str] = Field(
+        default=None,
+        description="Only return emails whose subject contains this text (filtered server-side)"
+    )
 
 class GetUnreadEmailsTool(GmailToolBase):
     """Tool to get unread emails from Gmail."""
@@ -222,16 +653,29 @@ class GetUnreadEmailsTool(GmailToolBase):
     description: str = "Gets unread emails from Gmail"
     args_schema: Type[BaseModel] = GetUnreadEmailsSchema
 
-    def _run(self, limit: Optional[int] = 5) -> List[Tuple[str, str, str, str, Dict]]:
+    def _run(self, limit: Optional[int] = 5, sender: Optional[str] = None,
+             subject_contains: Optional[str] = None) -> List[Tuple[str, str, str, str, Dict]]:
         """
         Fetch unread emails from Gmail up to the specified limit.
-        Returns a list of tuples: (subject, sender, body, email_id, thread_info)
+        Optional sender/subject filters are pushed into the server-side
+        SEARCH so only matching messages are ever downloaded.
+        Returns a list of tuples: (subject, sender, body, email_id, thread_info).
+        email_id is the message's IMAP UID, which stays valid across
+        concurrent mailbox changes (sequence numbers do not).
         """
+        # Validate the user-supplied filters before touching the network;
+        # ValueError propagates so callers can reject the request
+        criteria = ['UNSEEN']
+        if sender:
+            criteria += ['FROM', _quote_search_string(sender)]
+        if subject_contains:
+            criteria += ['SUBJECT', _quote_search_string(subject_contains)]
+
         mail = self._connect()
         try:
             print("DEBUG: Connecting to Gmail...")
-            mail.select("INBOX")
-            result, data = mail.search(None, 'UNSEEN')
+            _select_cached(mail, "INBOX")
+            result, data = mail.uid('SEARCH', None, *criteria)
             
             print(f"DEBUG: Search result: {result}")
             
@@ -248,21 +692,36 @@ class GetUnreadEmailsTool(GmailToolBase):
             email_ids = email_ids[:limit]
             print(f"DEBUG: Processing {len(email_ids)} emails")
             emails = []
-            for i, email_id in enumerate(email_ids):
-                print(f"DEBUG: Processing email {i+1}/{len(email_ids)}")
-                result, msg_data = mail.fetch(email_id, "(RFC822)")
-                if result != "OK":
-                    print(f"Error fetching email {email_id}:", result)
-                    continue
-                raw_email = msg_data[0][1]
-                msg = email.message_from_bytes(raw_email)
-                
+
+            # One batched FETCH for all requested messages instead of one
+            # round-trip per email, limited to the headers we read and a
+            # bounded body prefix; responses arrive in mailbox order, so
+            # reverse to keep the newest-first processing order
+            fetched = _bulk_fetch_groups(mail, email_ids, _UNREAD_FETCH_PARTS, uid=True)
+            fetched.reverse()
+            total = len(fetched)
+
+            for i in range(total):
+                email_id, literals = fetched[i]
+                # Drop the list's reference so each message's buffers can
+                # be reclaimed as soon as this iteration is done with them
+                fetched[i] = None
+                print(f"DEBUG: Processing email {i+1}/{total}")
+                msg = _message_from_literals(literals)
+
+                # Snapshot the headers into a dict once (first occurrence
+                # wins, as with Message.get) instead of walking the header
+                # list linearly for every field below
+                headers: Dict[str, str] = {}
+                for key, value in msg.items():
+                    headers.setdefault(key.lower(), value)
+
                 # Decode headers properly (handles encoded characters)
-                subject = decode_header_safe(msg["Subject"])
-                sender = decode_header_safe(msg["From"])
-                
+                subject = decode_header_safe(headers.get('subject'))
+                sender = decode_header_safe(headers.get('from'))
+
                 # Extract and standardize the date
-                date_str = msg.get("Date", "")
+                date_str = headers.get('date', '')
                 received_date = self._parse_email_date(date_str)
                 
                 # Get the current message body
@@ -271,25 +730,34 @@ class GetUnreadEmailsTool(GmailToolBase):
                 # Get thread messages
                 thread_messages = self._get_thread_messages(mail, msg)
                 
-                # Combine current message with thread history
-                full_body = "\n\n--- Previous Messages ---\n".join([current_body] + thread_messages)
-                
-                # Get thread metadata
+                # Combine current message with thread history bodies
+                full_body = "\n\n--- Previous Messages ---\n".join(
+                    [current_body] + [m.get('body', '') for m in thread_messages]
+                )
+
+                # Get thread metadata; keep the structured message list so
+                # consumers (e.g. format_thread_history) can render on demand
                 thread_info = {
-                    'message_id': msg.get('Message-ID', ''),
-                    'in_reply_to': msg.get('In-Reply-To', ''),
-                    'references': msg.get('References', ''),
+                    'message_id': headers.get('message-id', ''),
+                    'in_reply_to': headers.get('in-reply-to', ''),
+                    'references': headers.get('references', ''),
                     'date': received_date,  # Use standardized date
                     'raw_date': date_str,   # Keep original date string
-                    'email_id': email_id.decode('utf-8')
+                    'email_id': email_id.decode('utf-8'),
+                    'thread_messages': thread_messages
                 }
                 
                 # Add a clear date indicator in the body for easier extraction
                 full_body = f"EMAIL DATE: {received_date}\n\n{full_body}"
-                
+                if len(full_body) > _MAX_BODY_CHARS:
+                    full_body = full_body[:_MAX_BODY_CHARS]
+
                 # Print the structure of what we're appending
                 print(f"DEBUG: Email tuple structure: subject={subject}, sender={sender}, body_length={len(full_body)}, email_id={email_id.decode('utf-8')}, thread_info_keys={thread_info.keys()}")
                 emails.append((subject, sender, full_body, email_id.decode('utf-8'), thread_info))
+                # Release the parsed message and raw literals before the
+                # next iteration; only the extracted strings are kept
+                del msg, literals, headers
             
             print(f"DEBUG: Returning {len(emails)} email tuples")
             return emails
@@ -311,7 +779,7 @@ class GetUnreadEmailsTool(GmailToolBase):
         try:
             # Try various date formats commonly found in emails
             # Remove timezone name if present (like 'EDT', 'PST')
-            date_str = re.sub(r'\s+\([A-Z]{3,4}\)', '', date_str)
+            date_str = _TZ_NAME_RE.sub('', date_str)
             # Parse with email.utils
             parsed_date = email.utils.parsedate_to_datetime(date_str)
             if parsed_date:
@@ -341,35 +809,32 @@ class SaveDraftTool(BaseTool):
     def _format_body(self, body: str) -> str:
         """Format the email body with signature."""
         # Replace [Your name] or [Your Name] with Reon
-        body = re.sub(r'\[Your [Nn]ame\]', 'Reon', body)
-        
-        # If no placeholder was found, append the signature
-        if '[Your' not in body and '[your' not in body:
-            # Create a professional signature
-            signature = "\n"
-            body = f"{body}{signature}"
-        
+        body = _NAME_PLACEHOLDER_RE.sub('Reon', body)
+
+        # If no placeholder remains, append the signature
+        if not _SIG_PLACEHOLDER_RE.search(body):
+            body = f"{body}{_SIGNATURE}"
+
         return body
 
     def _connect(self):
-        """Connect to Gmail using IMAP."""
+        """Connect to Gmail through the shared connection pool."""
         # Get email credentials from environment
         email_address = os.environ.get('EMAIL_ADDRESS')
         app_password = os.environ.get('APP_PASSWORD')
-        
+
         if not email_address or not app_password:
             raise ValueError("EMAIL_ADDRESS or APP_PASSWORD environment variables not set")
-        
-        # Connect to Gmail's IMAP server
-        mail = imaplib.IMAP4_SSL('imap.gmail.com')
+
         print(f"Connecting to Gmail with email: {email_address[:3]}...{email_address[-10:]}")
-        mail.login(email_address, app_password)
+        mail = _pool_get(email_address, app_password)
         return mail, email_address
 
     def _disconnect(self, mail):
-        """Disconnect from Gmail."""
+        """Return the connection to the pool."""
+        mail.current_folder = None
         try:
-            mail.logout()
+            _pool_put(mail, os.environ.get('EMAIL_ADDRESS', ''))
         except:
             pass
 
@@ -406,7 +871,7 @@ class SaveDraftTool(BaseTool):
                         
                     # Search for drafts with this subject
                     search_criteria = f'SUBJECT "{subject}"'
-                    result, data = mail.search(None, search_criteria)
+                    result, data = mail.uid('SEARCH', None, search_criteria)
                     
                     if result == 'OK' and data[0]:
                         draft_count = len(data[0].split())
@@ -422,6 +887,35 @@ class SaveDraftTool(BaseTool):
             print(f"Error verifying draft: {e}")
             return False, None
 
+    def _log_draft(self, subject: str, recipient: str) -> None:
+        """
+        Record the saved draft in an append-only JSONL audit log: one
+        serialized record per line, so each save is a single append with
+        no read-modify-write of an ever-growing file.
+        """
+        try:
+            draft_data = {
+                "draft_id": f"draft_{_PID}_{time.time_ns()}_{next(_DRAFT_COUNTER)}",
+                "subject": subject,
+                "recipient": recipient,
+                "date": datetime.datetime.now().isoformat(),
+            }
+            if orjson is not None:
+                line = orjson.dumps(draft_data).decode()
+            else:
+                line = json.dumps(draft_data, separators=(",", ":"))
+            # Open for append directly; only create the directory on the
+            # first-ever write instead of stat'ing it on every draft
+            try:
+                log_file = open(_DRAFTS_LOG_PATH, "a", encoding="utf-8")
+            except FileNotFoundError:
+                os.makedirs(os.path.dirname(_DRAFTS_LOG_PATH), exist_ok=True)
+                log_file = open(_DRAFTS_LOG_PATH, "a", encoding="utf-8")
+            with log_file:
+                log_file.write(line + "\n")
+        except Exception as e:
+            print(f"Error logging saved draft: {e}")
+
     def _get_latest_thread_info(self, thread_info: Dict[str, Any]) -> Dict[str, Any]:
         """
         Ensure we have the latest message's thread info for proper threading.
@@ -450,17 +944,29 @@ class SaveDraftTool(BaseTool):
         # If we only have a single message_id, use that
         return thread_info
 
-    def _run(self, subject: str, body: str, recipient: str, thread_info: Optional[Dict[str, Any]] = None) -> str:
+    def _run(self, subject: str, body: str, recipient: str, thread_info: Optional[Dict[str, Any]] = None,
+             mail: Optional[imaplib.IMAP4_SSL] = None) -> str:
         """
         Save a draft email to Gmail Drafts folder.
+
+        An already-authenticated IMAP connection can be passed via `mail`
+        to avoid a fresh TLS handshake and LOGIN; the caller then keeps
+        ownership of the connection.
         """
+        owns_connection = mail is None
         try:
-            mail, email_address = self._connect()
-            
+            if owns_connection:
+                mail, email_address = self._connect()
+            else:
+                email_address = os.environ.get('EMAIL_ADDRESS')
+
             # Check available drafts folders
             drafts_folders = self._check_drafts_folder(mail)
             print(f"Available drafts folders: {drafts_folders}")
             
+            # The raw SELECTs below bypass the cached-mailbox tracking
+            mail.current_folder = None
+
             # Try with quoted folder name first
             drafts_folder = '"[Gmail]/Drafts"'
             print(f"Selecting drafts folder: {drafts_folder}")
@@ -485,9 +991,6 @@ class SaveDraftTool(BaseTool):
             
             # Format body and add signature
             body_with_signature = self._format_body(body)
-            message = email.message.EmailMessage()
-            message["From"] = email_address
-            message["To"] = recipient
 
             # --- Robust subject handling for threading and Gmail compatibility ---
             thread_subject = None
@@ -513,9 +1016,9 @@ class SaveDraftTool(BaseTool):
             if thread_info and not subject.lower().startswith('re:'):
                 subject = f"Re: {subject}"
 
-            message["Subject"] = subject
-
             # --- Always set threading headers if replying ---
+            references_header = None
+            in_reply_to_header = None
             if thread_info:
                 latest_thread_info = self._get_latest_thread_info(thread_info)
                 references = []
@@ -525,22 +1028,38 @@ class SaveDraftTool(BaseTool):
                     if latest_thread_info['message_id'] not in references:
                         references.append(latest_thread_info['message_id'])
                 if references:
-                    message["References"] = " ".join(references)
+                    references_header = " ".join(references)
                 if latest_thread_info.get('message_id'):
-                    message["In-Reply-To"] = latest_thread_info['message_id']
-
-            message.set_content(body_with_signature)
+                    in_reply_to_header = latest_thread_info['message_id']
+
+            # Hand-built bytes for the common ASCII-header draft; fall
+            # back to EmailMessage when headers need RFC 2047 encoding
+            raw_message = _build_rfc822_bytes(
+                email_address, recipient, subject, body_with_signature,
+                references=references_header, in_reply_to=in_reply_to_header)
+            if raw_message is None:
+                message = email.message.EmailMessage()
+                message["From"] = email_address
+                message["To"] = recipient
+                message["Subject"] = subject
+                if references_header:
+                    message["References"] = references_header
+                if in_reply_to_header:
+                    message["In-Reply-To"] = in_reply_to_header
+                message.set_content(body_with_signature)
+                raw_message = message.as_bytes()
 
             # Save to drafts
             print(f"Attempting to save draft to {drafts_folder}...")
             date = imaplib.Time2Internaldate(time.time())
-            result, data = mail.append(drafts_folder, '\\Draft', date, message.as_bytes())
+            result, data = mail.append(drafts_folder, r'(\Draft)', date, raw_message)
             
             if result != 'OK':
                 return f"Error saving draft: {result}, {data}"
             
             print(f"Draft save attempt result: {result}")
-            
+            self._log_draft(subject, recipient)
+
             # Verify the draft was actually saved
             verified, folder = self._verify_draft_saved(mail, subject, recipient)
             
@@ -550,7 +1069,7 @@ class SaveDraftTool(BaseTool):
                 # Try Gmail's API approach as a fallback
                 try:
                     # Try saving directly to All Mail and flagging as draft
-                    result, data = mail.append('[Gmail]/All Mail', '\\Draft', date, message.as_bytes())
+                    result, data = mail.append('[Gmail]/All Mail', r'(\Draft)', date, raw_message)
                     if result == 'OK':
                         return f"Draft saved to All Mail with subject: '{subject}' (flagged as draft)"
                     else:
@@ -560,7 +1079,8 @@ class SaveDraftTool(BaseTool):
         except Exception as e:
             return f"Error saving draft: {str(e)}"
         finally:
-            self._disconnect(mail)
+            if owns_connection and mail is not None:
+                self._disconnect(mail)
 
 # -------------------------------
 # Organize Email Tool
@@ -580,6 +1100,26 @@ class GmailOrganizeTool(GmailToolBase):
     description: str = "Organizes emails using Gmail's priority features based on category and priority"
     args_schema: Type[BaseModel] = GmailOrganizeSchema
 
+    _known_labels: Optional[set] = PrivateAttr(default=None)
+
+    def _list_labels(self, mail) -> set:
+        """Fetch the set of existing mailbox/label names, cached on the instance."""
+        if self._known_labels is None:
+            known = set()
+            try:
+                result, mailboxes = mail.list()
+                if result == 'OK':
+                    for mailbox in mailboxes:
+                        if not mailbox:
+                            continue
+                        # LIST lines look like: (\HasNoChildren) "/" "Label Name"
+                        name = mailbox.decode().rsplit(' "/" ', 1)[-1].strip('"')
+                        known.add(name)
+            except Exception as e:
+                print(f"Error listing labels: {e}")
+            self._known_labels = known
+        return self._known_labels
+
     def _run(self, email_id: str, category: str, priority: str, should_star: bool = False, labels: List[str] = None) -> str:
         """
         Organize an email with the specified parameters.
@@ -592,31 +1132,40 @@ class GmailOrganizeTool(GmailToolBase):
         mail = self._connect()
         try:
             # Select inbox to ensure we can access the email
-            mail.select("INBOX")
+            _select_cached(mail, "INBOX")
             
             # Apply organization based on category and priority
             if category == "Urgent Response Needed" and priority == "High":
-                # Star the email
                 if should_star:
-                    mail.store(email_id, '+FLAGS', '\\Flagged')
-                
-                # Mark as important
-                mail.store(email_id, '+FLAGS', '\\Important')
-                
+                    # \Flagged (the star) is a real IMAP flag; .SILENT
+                    # skips the server's echo of the new flag state
+                    mail.uid('STORE', email_id, '+FLAGS.SILENT', '\\Flagged')
+
+                # Gmail exposes importance as the \Important label, not a
+                # flag; fold it into the batched label STORE below
+                if '\\Important' not in labels:
+                    labels.append('\\Important')
+
                 # Apply URGENT label if it doesn't exist
                 if "URGENT" not in labels:
                     labels.append("URGENT")
 
-            # Apply all specified labels
+            # Create any missing labels, then apply them all in one STORE
+            # (Gmail accepts a parenthesized label list for X-GM-LABELS)
+            known_labels = self._list_labels(mail)
             for label in labels:
+                if label.startswith('\\') or label in known_labels:
+                    continue  # System labels and existing labels need no CREATE
                 try:
-                    # Create label if it doesn't exist
                     mail.create(label)
+                    known_labels.add(label)
                 except:
                     pass  # Label might already exist
-                
-                # Apply label
-                mail.store(email_id, '+X-GM-LABELS', label)
+            if labels:
+                # Quote names containing spaces, or they'd be parsed as
+                # separate one-word labels
+                label_list = ' '.join(f'"{label}"' if ' ' in label else label for label in labels)
+                mail.uid('STORE', email_id, '+X-GM-LABELS.SILENT', '(' + label_list + ')')
 
             return f"Email organized: Starred={should_star}, Labels={labels}"
 
@@ -634,7 +1183,7 @@ class GmailDeleteSchema(BaseModel):
     email_id: str = Field(..., description="Email ID to delete")
     reason: str = Field(..., description="Reason for deletion")
 
-class GmailDeleteTool(BaseTool):
+class GmailDeleteTool(GmailToolBase):
     """Tool to delete an email using IMAP."""
     name: str = "delete_email"
     description: str = "Deletes an email from Gmail"
@@ -655,20 +1204,21 @@ class GmailDeleteTool(BaseTool):
             
             mail = self._connect()
             try:
-                mail.select("INBOX")
-                
-                # First verify the email exists and get its details for logging
-                result, data = mail.fetch(email_id, "(RFC822)")
+                _select_cached(mail, "INBOX")
+
+                # First verify the email exists and get its details for logging.
+                # Only headers are needed here, so skip downloading the body.
+                result, data = mail.uid('FETCH', email_id, "(BODY.PEEK[HEADER])")
                 if result != "OK" or not data or data[0] is None:
                     return f"Error: Email with ID {email_id} not found"
-                    
-                msg = email.message_from_bytes(data[0][1])
+
+                msg = _HEADER_PARSER.parsebytes(data[0][1])
                 subject = decode_header_safe(msg["Subject"])
                 sender = decode_header_safe(msg["From"])
                 
                 # Move to Trash
-                mail.store(email_id, '+X-GM-LABELS', '\\Trash')
-                mail.store(email_id, '-X-GM-LABELS', '\\Inbox')
+                mail.uid('STORE', email_id, '+X-GM-LABELS', '\\Trash')
+                mail.uid('STORE', email_id, '-X-GM-LABELS', '\\Inbox')
                 
                 return f"Email deleted: '{subject}' from {sender}. Reason: {reason}"
             except Exception as e:
@@ -679,6 +1229,46 @@ class GmailDeleteTool(BaseTool):
         except Exception as e:
             return f"Error deleting email: {str(e)}"
 
+# -------------------------------
+# Mark As Read Tool
+# -------------------------------
+
+class MarkEmailsAsReadSchema(BaseModel):
+    """Schema for MarkEmailsAsReadTool input."""
+    email_ids: List[str] = Field(..., description="Email IDs to mark as read (one or many)")
+
+class MarkEmailsAsReadTool(GmailToolBase):
+    """Tool to mark emails as read using IMAP."""
+    name: str = "mark_emails_as_read"
+    description: str = "Marks one or more emails as read in Gmail"
+    args_schema: Type[BaseModel] = MarkEmailsAsReadSchema
+
+    def _run(self, email_ids: List[str]) -> str:
+        """
+        Mark the given emails as read. All ids are flagged with a single
+        UID STORE per batch instead of one round-trip per email, so
+        marking N emails costs one command, not N.
+        """
+        if isinstance(email_ids, str):
+            email_ids = [email_ids]
+        if not email_ids:
+            return "No email IDs provided."
+
+        mail = self._connect()
+        try:
+            _select_cached(mail, "INBOX")
+            ids = [eid if isinstance(eid, bytes) else str(eid).encode() for eid in email_ids]
+            for i in range(0, len(ids), 500):
+                batch = ids[i:i + 500]
+                result, _ = mail.uid('STORE', b','.join(batch), '+FLAGS.SILENT', '\\Seen')
+                if result != 'OK':
+                    return f"Error marking emails as read: {result}"
+            return f"Marked {len(ids)} email(s) as read."
+        except Exception as e:
+            return f"Error marking emails as read: {e}"
+        finally:
+            self._disconnect(mail)
+
 # -------------------------------
 # Empty Trash Tool
 # -------------------------------
@@ -689,27 +1279,25 @@ class EmptyTrashTool(BaseTool):
     description: str = "Empties the Gmail trash folder to free up space"
 
     def _connect(self):
-        """Connect to Gmail using IMAP."""
+        """Connect to Gmail through the shared connection pool."""
         # Get email credentials from environment
         email_address = os.environ.get('EMAIL_ADDRESS')
         app_password = os.environ.get('APP_PASSWORD')
-        
+
         if not email_address or not app_password:
             raise ValueError("EMAIL_ADDRESS or APP_PASSWORD environment variables not set")
-        
-        # Connect to Gmail's IMAP server
-        mail = imaplib.IMAP4_SSL('imap.gmail.com')
+
         print(f"Connecting to Gmail with email: {email_address[:3]}...{email_address[-10:]}")
-        mail.login(email_address, app_password)
-        return mail
+        return _pool_get(email_address, app_password)
 
     def _disconnect(self, mail):
-        """Disconnect from Gmail."""
+        """Return the connection to the pool."""
+        mail.current_folder = None
         try:
-            mail.logout()
+            _pool_put(mail, os.environ.get('EMAIL_ADDRESS', ''))
         except:
             pass
-    
+
     def _run(self) -> str:
         """
         Empty the Gmail trash folder.
@@ -717,6 +1305,9 @@ class EmptyTrashTool(BaseTool):
         try:
             mail = self._connect()
             
+            # The raw SELECTs below bypass the cached-mailbox tracking
+            mail.current_folder = None
+
             # Try different trash folder names (Gmail can have different naming conventions)
             trash_folders = [
                 '"[Gmail]/Trash"',
@@ -736,9 +1327,10 @@ class EmptyTrashTool(BaseTool):
                         trash_folder_used = folder
                         print(f"Successfully selected trash folder: {folder}")
                         
-                        # Search for all messages in trash
-                        result, data = mail.search(None, 'ALL')
-                        
+                        # Search for all messages in trash (UIDs stay stable
+                        # across the EXPUNGE below, unlike sequence numbers)
+                        result, data = mail.uid('SEARCH', None, 'ALL')
+
                         if result == 'OK':
                             email_ids = data[0].split()
                             count = len(email_ids)
@@ -746,11 +1338,13 @@ class EmptyTrashTool(BaseTool):
                                 print("No messages found in trash.")
                                 return "Trash is already empty. No messages to delete."
                             print(f"Found {count} messages in trash.")
-                            
-                            # Delete all messages in trash
-                            for email_id in email_ids:
-                                mail.store(email_id, '+FLAGS', '\\Deleted')
-                            
+
+                            # Flag all messages deleted with one STORE per
+                            # batch of 500 instead of one round-trip each
+                            for i in range(0, count, 500):
+                                batch = email_ids[i:i + 500]
+                                mail.uid('STORE', b','.join(batch), '+FLAGS', '\\Deleted')
+
                             # Permanently remove messages marked for deletion
                             mail.expunge()
                             success = True
@@ -781,10 +1375,15 @@ class ThreadHistorySchema(BaseModel):
         description="Whether to include information about attachments in the history"
     )
     max_depth: Optional[int] = Field(
-        default=10, 
+        default=10,
         description="Maximum number of emails to retrieve in the thread history",
         ge=1
     )
+    latest_k: Optional[int] = Field(
+        default=None,
+        description="When set, keep only the K most recent messages of the thread",
+        ge=1
+    )
 
 class GetThreadHistoryTool(GmailToolBase):
     """Tool to retrieve the complete history of an email thread."""
@@ -792,7 +1391,8 @@ class GetThreadHistoryTool(GmailToolBase):
     description: str = "Gets the complete conversation history for an email thread"
     args_schema: Type[BaseModel] = ThreadHistorySchema
     
-    def _run(self, email_id: str, include_attachments: bool = False, max_depth: int = 10) -> Dict[str, Any]:
+    def _run(self, email_id: str, include_attachments: bool = False, max_depth: int = 10,
+             latest_k: Optional[int] = None, mail: Optional[imaplib.IMAP4_SSL] = None) -> Dict[str, Any]:
         """
         Fetch the complete history of an email thread.
 
@@ -800,79 +1400,81 @@ class GetThreadHistoryTool(GmailToolBase):
             email_id: The email ID to get thread history for
             include_attachments: Whether to include attachment info
             max_depth: Maximum number of emails to retrieve
+            latest_k: When set, keep only the K most recent messages
+            mail: Optional already-authenticated IMAP connection to reuse;
+                when omitted, the tool connects and disconnects itself
 
         Returns:
             A dictionary containing the thread history and metadata
         """
-        mail = self._connect()
+        owns_connection = mail is None
+        if owns_connection:
+            mail = self._connect()
         try:
-            mail.select("INBOX")
+            _select_cached(mail, "INBOX")
             
-            # Fetch the target email first
-            result, data = mail.fetch(email_id, "(RFC822)")
-            if result != "OK":
+            # Fetch the target email first (headers + text via PEEK, so the
+            # message is not marked read as a side effect)
+            raw_email = next(iter(_bulk_fetch(mail, [email_id], uid=True)), None)
+            if raw_email is None:
                 return {"error": f"Failed to fetch email with ID {email_id}"}
-                
-            raw_email = data[0][1]
-            root_msg = email.message_from_bytes(raw_email)
+
+            root_msg = _BYTES_PARSER.parsebytes(raw_email)
             
             # Extract the Message-ID, References, and In-Reply-To
             message_id = root_msg.get("Message-ID", "").strip()
             references = root_msg.get("References", "").strip().split()
             in_reply_to = root_msg.get("In-Reply-To", "").strip()
             
-            # Collect all relevant message IDs for the thread
-            thread_ids = set()
-            if message_id:
-                thread_ids.add(message_id)
-            if in_reply_to:
-                thread_ids.add(in_reply_to)
-            thread_ids.update(references)
-            
-            # Remove any empty strings
-            thread_ids = {tid for tid in thread_ids if tid}
+            # Collect all relevant message IDs for the thread in one pass,
+            # dropping empty strings as we go
+            thread_ids = {tid for tid in itertools.chain([message_id, in_reply_to], references) if tid}
             print(f"Found {len(thread_ids)} related message IDs in thread")
             
-            # Now search for all emails in this thread
+            # Now search for all emails in this thread. Prefer Gmail's
+            # X-GM-THRID extension (3 round-trips total); fall back to the
+            # header-based search on servers without it.
             thread_messages = []
             thread_messages.append(self._process_message(root_msg, include_attachments))
+
+            found_ids = self._search_thread_gmail(mail, email_id)
+            thread_mailbox = '"[Gmail]/All Mail"'
+            if found_ids is None:
+                # The Gmail path may have left the connection on All Mail
+                # (or in AUTH state after a failed All Mail SELECT, e.g.
+                # when the user hides All Mail from IMAP); get back onto
+                # INBOX so the fallback searches run there and the ids
+                # they return match thread_mailbox.
+                thread_mailbox = "INBOX"
+                mail.current_folder = None
+                if _select_cached(mail, "INBOX") != 'OK':
+                    return {"error": "Failed to select INBOX for thread search"}
+                found_ids = self._search_thread_rfc5256(mail, email_id)
+            if found_ids is None:
+                found_ids = self._search_thread_headers(mail, thread_ids)
+
+            if found_ids:
+                print(f"Found {len(found_ids)} emails in thread")
+
+                # Limit to max_depth
+                if len(found_ids) > max_depth:
+                    found_ids = found_ids[:max_depth]
+
+                # Fetch all thread members in batched FETCH commands
+                for msg in self._fetch_thread_raw(mail, found_ids, thread_mailbox, include_attachments):
+                    message_info = self._process_message(msg, include_attachments)
+                    # Skip the root message as we already processed it
+                    # (sequence numbers differ across mailboxes, so
+                    # compare Message-IDs instead)
+                    if message_info.get('message_id') and message_info['message_id'] == message_id:
+                        continue
+                    thread_messages.append(message_info)
             
-            if thread_ids:
-                # Build search query for all messages in thread
-                search_terms = []
-                for tid in thread_ids:
-                    # Search by header field
-                    search_terms.append(f'HEADER Message-ID "{tid}"')
-                    search_terms.append(f'HEADER References "{tid}"')
-                    search_terms.append(f'HEADER In-Reply-To "{tid}"')
-                
-                search_query = ' OR '.join(search_terms)
-                
-                # Execute the search
-                result, data = mail.search(None, search_query)
-                if result == "OK" and data[0]:
-                    found_ids = data[0].split()
-                    print(f"Found {len(found_ids)} emails in thread")
-                    
-                    # Limit to max_depth
-                    if len(found_ids) > max_depth:
-                        found_ids = found_ids[:max_depth]
-                    
-                    # Process each message
-                    for msg_id in found_ids:
-                        # Skip the root message as we already processed it
-                        if msg_id.decode('utf-8') == email_id:
-                            continue
-                        result, msg_data = mail.fetch(msg_id, "(RFC822)")
-                        if result == "OK":
-                            msg = email.message_from_bytes(msg_data[0][1])
-                            thread_messages.append(self._process_message(msg, include_attachments))
-            
-            # Sort messages by date
-            thread_messages.sort(key=lambda x: email.utils.parsedate_to_datetime(x['date']) 
-                               if x.get('date') and email.utils.parsedate_to_datetime(x['date']) 
-                               else datetime.datetime.min)
-            
+            # Sort messages by date (single parse per message, cache popped
+            # again before the dict leaves this function); latest_k trims
+            # the thread to its newest messages via heap selection
+            thread_messages = _sort_messages_by_date(thread_messages, latest_k)
+
             # Create a dictionary with thread info and messages
             thread_history = {
                 "thread_messages": thread_messages,
@@ -889,7 +1491,132 @@ class GetThreadHistoryTool(GmailToolBase):
             traceback.print_exc()
             return {"error": str(e)}
         finally:
-            self._disconnect(mail)
+            if owns_connection:
+                self._disconnect(mail)
+
+    # Number of connections to fan fetches across for large threads; kept
+    # small to stay well under Gmail's per-account connection cap.
+    _THREAD_FETCH_WORKERS = 3
+
+    def _fetch_thread_raw(self, mail, found_ids: List[bytes], mailbox: str,
+                          include_attachments: bool = False) -> List[email.message.Message]:
+        """
+        Fetch and parse the thread messages, fanning the batches out across
+        a few pooled connections when the thread spans multiple FETCH
+        batches. Small threads stay on the caller's connection. Order is
+        not preserved; callers sort by date afterwards. Unless attachment
+        info is requested (which needs the full text to size payloads),
+        only a bounded body prefix is downloaded per message.
+        """
+        parts = _PEEK_MESSAGE_PARTS if include_attachments else _THREAD_FETCH_PARTS
+        if len(found_ids) <= FETCH_BATCH_SIZE:
+            groups = _bulk_fetch_groups(mail, found_ids, parts, uid=True)
+        else:
+            # One FETCH-sized batch per submitted task, so batches overlap on
+            # the wire instead of running back-to-back on a single connection.
+            batches = [found_ids[i:i + FETCH_BATCH_SIZE] for i in range(0, len(found_ids), FETCH_BATCH_SIZE)]
+            workers = min(self._THREAD_FETCH_WORKERS, len(batches))
+
+            def fetch_batch(batch):
+                conn = self._connect()
+                try:
+                    _select_cached(conn, mailbox, readonly=True)
+                    return _bulk_fetch_groups(conn, batch, parts, uid=True)
+                finally:
+                    self._disconnect(conn)
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(fetch_batch, batches)
+            groups = [group for batch_groups in results for group in batch_groups]
+
+        return [_message_from_literals(literals) for _, literals in groups]
+
+    def _search_thread_gmail(self, mail, email_id: str) -> Optional[List[bytes]]:
+        """
+        Find all thread members via Gmail's X-GM-THRID extension.
+
+        Fetches the thread id from the anchor message, then searches
+        [Gmail]/All Mail for every message carrying the same thread id.
+        Returns the matching IDs, or None when the extension or the
+        All Mail mailbox is unavailable (caller falls back to header search).
+        """
+        try:
+            if 'X-GM-EXT-1' not in _connection_caps(mail):
+                return None
+
+            result, data = mail.uid('FETCH', email_id, '(X-GM-THRID)')
+            if result != 'OK' or not data or not data[0]:
+                return None
+            thrid_match = re.search(rb'X-GM-THRID (\d+)', data[0])
+            if not thrid_match:
+                return None
+            thrid = thrid_match.group(1).decode()
+
+            result = _select_cached(mail, '"[Gmail]/All Mail"', readonly=True)
+            if result != 'OK':
+                return None
+
+            result, data = mail.uid('SEARCH', None, 'X-GM-THRID', thrid)
+            if result != 'OK' or not data[0]:
+                return None
+            return data[0].split()
+        except Exception as e:
+            print(f"Gmail thread search failed, falling back to header search: {e}")
+            return None
+
+    def _search_thread_rfc5256(self, mail, email_id: str) -> Optional[List[bytes]]:
+        """
+        Find thread members via RFC 5256 server-side threading when the
+        server advertises THREAD=REFERENCES (or the REFS variant). Returns
+        the IDs of the thread containing the anchor, or None when the
+        capability is absent or the anchor is not found (caller falls back
+        to the header search).
+        """
+        try:
+            capabilities = _connection_caps(mail)
+            if 'THREAD=REFERENCES' in capabilities:
+                algorithm = 'REFERENCES'
+            elif 'THREAD=REFS' in capabilities:
+                algorithm = 'REFS'
+            else:
+                return None
+
+            typ, dat = mail._simple_command('UID', 'THREAD', algorithm, 'UTF-8', 'ALL')
+            typ, dat = mail._untagged_response(typ, dat, 'THREAD')
+            if typ != 'OK' or not dat or dat[0] is None:
+                return None
+
+            anchor = email_id.encode() if isinstance(email_id, str) else email_id
+            for cluster in _parse_thread_response(dat[0]):
+                if anchor in cluster:
+                    return cluster
+            return None
+        except Exception as e:
+            print(f"Server-side THREAD search failed, falling back to header search: {e}")
+            return None
+
+    def _search_thread_headers(self, mail, thread_ids) -> List[bytes]:
+        """
+        Search the selected mailbox for thread members by Message-ID headers.
+        Fallback path for servers without Gmail's thread-id extension.
+        """
+        if not thread_ids:
+            return []
+
+        # Build search query for all messages in thread
+        search_terms = []
+        for tid in thread_ids:
+            # Search by header field
+            search_terms.append(f'HEADER Message-ID "{tid}"')
+            search_terms.append(f'HEADER References "{tid}"')
+            search_terms.append(f'HEADER In-Reply-To "{tid}"')
+
+        search_query = ' OR '.join(search_terms)
+
+        result, data = mail.uid('SEARCH', None, search_query)
+        if result == "OK" and data[0]:
+            return data[0].split()
+        return []
 
     def _process_message(self, msg, include_attachments: bool) -> Dict[str, Any]:
         """
@@ -911,14 +1638,18 @@ class GetThreadHistoryTool(GmailToolBase):
         attachments = []
         if include_attachments and msg.is_multipart():
             for part in msg.walk():
-                if part.get_content_disposition() == 'attachment':
-                    filename = part.get_filename()
-                    if filename:
-                        attachments.append({
-                            "filename": decode_header_safe(filename),
-                            "type": part.get_content_type(),
-                            "size": len(part.get_payload(decode=True)) if part.get_payload(decode=True) else 0
-                        })
+                if part.get_content_disposition() != 'attachment':
+                    continue
+                filename = part.get_filename()
+                if filename:
+                    # Decode the payload once; the old code decoded it twice
+                    # (once for the truthiness check, once for len)
+                    payload = part.get_payload(decode=True)
+                    attachments.append({
+                        "filename": decode_header_safe(filename),
+                        "type": part.get_content_type(),
+                        "size": len(payload) if payload else 0
+                    })
         
         # Create message dict
         message_dict = {
@@ -939,15 +1670,15 @@ class GetThreadHistoryTool(GmailToolBase):
         """
         Extract all unique participants from the thread.
         """
-        participants = set()
-        for msg in messages:
-            # Extract email addresses from sender and recipient fields
-            for field in ['sender', 'to', 'cc', 'bcc']:
-                if field in msg and msg[field]:
-                    # Use regex to extract email addresses
-                    emails = re.findall(r'[\w\.-]+@[\w\.-]+', msg[field])
-                    participants.update(emails)
-        return list(participants)
+        # Join all address fields and extract the addresses in a single
+        # regex pass, instead of one findall per message per field
+        blob = '\n'.join(
+            msg[field]
+            for msg in messages
+            for field in ('sender', 'to', 'cc', 'bcc')
+            if msg.get(field)
+        )
+        return list(set(_EMAIL_ADDR_RE.findall(blob)))
 
 # -------------------------------
 # Context-Aware Reply Tool
@@ -975,12 +1706,13 @@ class ContextAwareReplyTool(GmailToolBase):
         mail = self._connect()
         try:
             # Fetch the email to reply to
-            result, data = mail.fetch(email_id, "(RFC822)")
+            _select_cached(mail, "INBOX")
+            result, data = mail.uid('FETCH', email_id, "(RFC822)")
             if result != "OK":
                 return f"Failed to fetch email with ID {email_id}"
                 
             raw_email = data[0][1]
-            msg = email.message_from_bytes(raw_email)
+            msg = _BYTES_PARSER.parsebytes(raw_email)
             
             # Extract key information
             original_subject = decode_header_safe(msg["Subject"])
@@ -988,7 +1720,7 @@ class ContextAwareReplyTool(GmailToolBase):
             reply_to = msg.get("Reply-To", sender)
             
             # Extract email address from the sender/reply-to field
-            recipient_match = re.search(r'<([^>]+)>', reply_to)
+            recipient_match = _ANGLE_ADDR_RE.search(reply_to)
             if recipient_match:
                 recipient = recipient_match.group(1)
             else:
@@ -1012,12 +1744,15 @@ class ContextAwareReplyTool(GmailToolBase):
             }
             
             if include_history:
-                # Fetch thread history
+                # Fetch thread history, reusing this tool's connection so the
+                # child tool skips a second TLS handshake and LOGIN
                 thread_history_tool = GetThreadHistoryTool()
                 thread_history = thread_history_tool._run(
                     email_id=email_id,
                     include_attachments=True,
-                    max_depth=max_history_depth
+                    max_depth=max_history_depth,
+                    latest_k=max_history_depth,
+                    mail=mail
                 )
                 
                 # Add thread history to thread_info
@@ -1025,13 +1760,14 @@ class ContextAwareReplyTool(GmailToolBase):
                 thread_info['thread_subject'] = thread_history.get('thread_subject', '')
                 thread_info['participants'] = thread_history.get('participants', [])
             
-            # Use SaveDraftTool to save the draft
+            # Use SaveDraftTool to save the draft, again on the same connection
             draft_tool = SaveDraftTool()
             result = draft_tool._run(
                 subject=subject,
                 body=body,
                 recipient=recipient,
-                thread_info=thread_info
+                thread_info=thread_info,
+                mail=mail
             )
             
             return result